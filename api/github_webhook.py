@@ -2,13 +2,14 @@
 GitHub webhook handler for PR events.
 """
 from fastapi import APIRouter, Request, HTTPException, Header
+import asyncio
 import hmac
 import hashlib
 import os
 from typing import Optional
 from github_client import GitHubClient, GitHubAppClient
 from github_db import is_auto_review_enabled, save_pr_review
-from src.llm_client import analyze_code_diff
+from src.llm_client import analyze_code_diff_async
 
 router = APIRouter(prefix="/github", tags=["GitHub Webhooks"])
 
@@ -75,17 +76,18 @@ async def handle_pull_request(payload: dict):
         github_client = GitHubAppClient(installation_id)
         
         # Fetch PR diff
-        diff = github_client.get_pr_diff(repo_full_name, pr_number)
+        diff = await asyncio.to_thread(github_client.get_pr_diff, repo_full_name, pr_number)
         
         if not diff:
             return {"status": "no_changes", "pr": pr_number}
         
         # Get AI review
-        review = analyze_code_diff(diff)
+        review = await analyze_code_diff_async(diff)
         
         # Post review comments
         commit_id = pr["head"]["sha"]
-        github_client.post_review_comments(
+        await asyncio.to_thread(
+            github_client.post_review_comments,
             repo_full_name, 
             pr_number, 
             review, 
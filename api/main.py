@@ -8,16 +8,18 @@ Provides REST API for code review functionality with GitHub integration.
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 import sys
 import os
+import json
 from pathlib import Path
 
 # Add src to path for LLM client
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.llm_client import analyze_code_diff
+from src.llm_client import analyze_code_diff_async, stream_code_diff
 
 # Import GitHub routers
 from github_auth import router as github_auth_router
@@ -80,7 +82,7 @@ async def create_review(request: ReviewRequest):
         logger.info(f"Received review request for {len(request.code_diff)} characters of {request.language} code")
         
         # Get AI review
-        review_text = analyze_code_diff(request.code_diff)
+        review_text = await analyze_code_diff_async(request.code_diff)
         logger.info(f"Got review text: {len(review_text)} characters")
         
         # Parse into structured format
@@ -92,6 +94,34 @@ async def create_review(request: ReviewRequest):
         logger.error(f"Review failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/review/stream")
+async def create_review_stream(request: ReviewRequest):
+    """
+    Stream the review as Server-Sent Events while the model generates it.
+    
+    Each `data:` event carries a markdown chunk; a final `done` event
+    carries the structured review in the same shape as /api/review.
+    """
+    import logging
+    
+    logger = logging.getLogger(__name__)
+    
+    def event_stream():
+        review_text = ""
+        try:
+            for chunk in stream_code_diff(request.code_diff):
+                review_text += chunk
+                yield f"data: {json.dumps({'text': chunk})}\n\n"
+            
+            parsed = parse_review(review_text)
+            yield f"event: done\ndata: {parsed.model_dump_json()}\n\n"
+        except Exception as e:
+            logger.error(f"Streaming review failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    # Sync generator is iterated in Starlette's threadpool, off the event loop
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.get("/api/stats")
 async def get_stats():
     """Get review statistics"""
@@ -47,11 +47,23 @@ class ConfigManager:
                     '*.min.js',
                     '*.min.css'
                 ],
-                'include_patterns': []
+                'include_patterns': [],
+                'parallel': False,
+                'max_workers': 4,
+                'minimize': True
             },
             'model': {
                 'name': 'gemini-2.5-flash',
-                'temperature': 0.3
+                'temperature': 0.3,
+                'max_input_tokens': None
+            },
+            'routing': {
+                'enabled': False,
+                'fast_model': 'gemini-2.5-flash-lite',
+                'strong_model': 'gemini-2.5-pro',
+                'max_fast_tokens': 4000,
+                'escalate_on_critical': True,
+                'risk_patterns': []
             },
             'custom_rules': []
         }
@@ -68,6 +80,42 @@ class ConfigManager:
         # Fallback for direct model name
         return self.config.get('model', 'gemini-2.5-flash')
     
+    def get_routing_config(self) -> Dict:
+        """Get model cascade settings, filling in defaults for missing keys."""
+        routing = dict(self._default_config()['routing'])
+        routing.update(self.config.get('routing') or {})
+        return routing
+    
+    def get_generation_config(self) -> Dict:
+        """Get model generation settings."""
+        model = self.config.get('model')
+        if isinstance(model, dict) and model.get('temperature') is not None:
+            return {'temperature': model['temperature']}
+        return {}
+    
+    def get_max_diff_size(self) -> int:
+        """Get maximum diff size to review, in KB."""
+        return int(self.config.get('review', {}).get('max_diff_size', 100))
+    
+    def get_max_input_tokens(self) -> Optional[int]:
+        """Get per-request input token cap (None uses the model's context)."""
+        model = self.config.get('model')
+        if isinstance(model, dict):
+            return model.get('max_input_tokens')
+        return None
+    
+    def is_minimize_enabled(self) -> bool:
+        """Check if noise (lockfiles, whitespace-only hunks...) is stripped before review."""
+        return bool(self.config.get('review', {}).get('minimize', True))
+    
+    def is_parallel_enabled(self) -> bool:
+        """Check if files should be reviewed in parallel requests."""
+        return bool(self.config.get('review', {}).get('parallel', False))
+    
+    def get_max_workers(self) -> int:
+        """Get maximum number of concurrent review requests."""
+        return int(self.config.get('review', {}).get('max_workers', 4))
+    
     def get_ignore_patterns(self) -> List[str]:
         """Get file patterns to ignore."""
         return self.config.get('review', {}).get('ignore_patterns', [])
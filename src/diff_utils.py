@@ -0,0 +1,355 @@
+"""
+Helpers for splitting unified diffs into reviewable pieces.
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FILE_HEADER_RE = re.compile(r'^diff --git a/(.+?) b/(.+)$')
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+# Generated files that are never worth sending to the model
+LOCKFILE_NAMES = {
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'npm-shrinkwrap.json',
+    'poetry.lock', 'Pipfile.lock', 'Cargo.lock', 'go.sum', 'composer.lock',
+    'Gemfile.lock', 'mix.lock', 'pubspec.lock',
+}
+GENERATED_SUFFIXES = ('.min.js', '.min.css', '.min.map', '.js.map', '.css.map', '.pb.go', '_pb2.py')
+VENDORED_DIRS = {'vendor', 'third_party', 'node_modules', 'dist'}
+
+
+def split_diff_by_file(diff: str) -> List[str]:
+    """
+    Split a unified diff into one chunk per file.
+    
+    Chunks start at each ``diff --git`` header. Any text before the first
+    header is kept with the first chunk. A diff without headers is returned
+    as a single chunk.
+    
+    Args:
+        diff: Git diff string
+    
+    Returns:
+        List of per-file diff strings
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    seen_header = False
+    
+    for line in diff.splitlines(keepends=True):
+        if line.startswith('diff --git '):
+            if seen_header:
+                chunks.append(''.join(current))
+                current = []
+            seen_header = True
+        current.append(line)
+    
+    if current:
+        chunks.append(''.join(current))
+    
+    return chunks
+
+
+def get_file_path(file_diff: str) -> Optional[str]:
+    """
+    Extract the (new) file path from a per-file diff chunk.
+    
+    Args:
+        file_diff: Diff for a single file
+    
+    Returns:
+        File path or None if the chunk has no ``diff --git`` header
+    """
+    for line in file_diff.splitlines():
+        match = FILE_HEADER_RE.match(line)
+        if match:
+            return match.group(2)
+    return None
+
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a piece of text without a tokenizer.
+    
+    Words count as one token per four characters (rounded up) and every
+    punctuation character counts as one token, which tracks subword
+    tokenizers closely on source code.
+    
+    Args:
+        text: Text to estimate
+    
+    Returns:
+        Estimated token count
+    """
+    tokens = 0
+    for match in TOKEN_RE.finditer(text):
+        piece = match.group(0)
+        tokens += (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == '_' else 1
+    return tokens
+
+
+def split_file_by_hunks(file_diff: str) -> Tuple[str, List[str]]:
+    """
+    Split a single-file diff into its header and hunks.
+    
+    Args:
+        file_diff: Diff for a single file
+    
+    Returns:
+        Tuple of (header lines before the first hunk, list of hunks)
+    """
+    header: List[str] = []
+    hunks: List[str] = []
+    current: List[str] = []
+    
+    for line in file_diff.splitlines(keepends=True):
+        if line.startswith('@@'):
+            if current:
+                hunks.append(''.join(current))
+            current = [line]
+        elif current:
+            current.append(line)
+        else:
+            header.append(line)
+    
+    if current:
+        hunks.append(''.join(current))
+    
+    return ''.join(header), hunks
+
+
+def split_oversized_file(file_diff: str, max_tokens: int) -> List[str]:
+    """
+    Split a single-file diff that exceeds the token budget at hunk boundaries.
+    
+    Each piece repeats the file header so it can be reviewed on its own.
+    A single hunk that is still too large is split at line boundaries.
+    
+    Args:
+        file_diff: Diff for a single file
+        max_tokens: Token budget per piece
+    
+    Returns:
+        List of diff pieces, each within the budget where possible
+    """
+    if estimate_tokens(file_diff) <= max_tokens:
+        return [file_diff]
+    
+    header, hunks = split_file_by_hunks(file_diff)
+    header_tokens = estimate_tokens(header)
+    budget = max(max_tokens - header_tokens, 1)
+    
+    pieces: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    
+    for unit in _split_units(hunks, budget):
+        unit_tokens = estimate_tokens(unit)
+        if current and current_tokens + unit_tokens > budget:
+            pieces.append(header + ''.join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += unit_tokens
+    
+    if current:
+        pieces.append(header + ''.join(current))
+    
+    return pieces or [file_diff]
+
+
+def pack_diff(diff: str, max_tokens: int) -> List[str]:
+    """
+    Bin-pack a diff into as few requests as fit the token budget.
+    
+    Files are kept whole where possible and packed first-fit-decreasing;
+    files larger than the budget are split at hunk boundaries first.
+    
+    Args:
+        diff: Git diff string
+        max_tokens: Token budget per request
+    
+    Returns:
+        List of diff chunks, one per request
+    """
+    if estimate_tokens(diff) <= max_tokens:
+        return [diff]
+    
+    pieces = []
+    for file_diff in split_diff_by_file(diff):
+        for piece in split_oversized_file(file_diff, max_tokens):
+            pieces.append((estimate_tokens(piece), piece))
+    
+    bins: List[List[str]] = []
+    bin_tokens: List[int] = []
+    
+    for tokens, piece in sorted(pieces, key=lambda item: item[0], reverse=True):
+        for index, used in enumerate(bin_tokens):
+            if used + tokens <= max_tokens:
+                bins[index].append(piece)
+                bin_tokens[index] += tokens
+                break
+        else:
+            bins.append([piece])
+            bin_tokens.append(tokens)
+    
+    return [''.join(chunk) for chunk in bins]
+
+
+def _split_units(hunks: List[str], budget: int) -> List[str]:
+    """Break hunks that exceed the budget into line-bounded parts."""
+    units: List[str] = []
+    
+    for hunk in hunks:
+        if estimate_tokens(hunk) <= budget:
+            units.append(hunk)
+            continue
+        
+        part: List[str] = []
+        part_tokens = 0
+        for line in hunk.splitlines(keepends=True):
+            line_tokens = estimate_tokens(line)
+            if part and part_tokens + line_tokens > budget:
+                units.append(''.join(part))
+                part, part_tokens = [], 0
+            part.append(line)
+            part_tokens += line_tokens
+        if part:
+            units.append(''.join(part))
+    
+    return units
+
+
+def limit_diff_size(diff: str, max_bytes: int) -> Tuple[str, List[str]]:
+    """
+    Keep whole files from the start of a diff until the size limit is reached.
+    
+    Args:
+        diff: Git diff string
+        max_bytes: Maximum size of the returned diff in bytes
+    
+    Returns:
+        Tuple of (diff within the limit, paths of files that were dropped)
+    """
+    if len(diff.encode('utf-8')) <= max_bytes:
+        return diff, []
+    
+    kept: List[str] = []
+    skipped: List[str] = []
+    size = 0
+    
+    for file_diff in split_diff_by_file(diff):
+        file_size = len(file_diff.encode('utf-8'))
+        if size + file_size <= max_bytes:
+            kept.append(file_diff)
+            size += file_size
+        else:
+            skipped.append(get_file_path(file_diff) or "unknown")
+    
+    return ''.join(kept), skipped
+
+
+def minimize_diff(
+    diff: str,
+    should_review: Optional[Callable[[str], bool]] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Strip content that never needs AI review before building the prompt.
+    
+    Removes files excluded by ``should_review`` and generated files
+    (lockfiles, minified bundles, vendored code), collapses binary and
+    rename-only changes to a one-line note, drops ``index`` header lines
+    and hunks that only change whitespace.
+    
+    Args:
+        diff: Git diff string
+        should_review: Optional predicate on file path (e.g.
+            ``ConfigManager.should_review_file``)
+        
+    Returns:
+        Tuple of (minimized diff, stats dict with skipped files and the
+        bytes and estimated tokens saved)
+    """
+    kept: List[str] = []
+    skipped: List[str] = []
+    
+    for file_diff in split_diff_by_file(diff):
+        path = get_file_path(file_diff)
+        
+        if path and (_is_generated_file(path) or (should_review and not should_review(path))):
+            skipped.append(path)
+            continue
+        
+        header, hunks = split_file_by_hunks(file_diff)
+        header_lines = [
+            line for line in header.splitlines(keepends=True)
+            if not line.startswith('index ')
+        ]
+        
+        if _is_binary(header_lines):
+            kept.append(_collapsed_header(header_lines, "Binary file changed"))
+            continue
+        
+        if not hunks and any(line.startswith('rename from ') for line in header_lines):
+            kept.append(_collapsed_header(header_lines, None))
+            continue
+        
+        review_hunks = [hunk for hunk in hunks if not _is_whitespace_only(hunk)]
+        if hunks and not review_hunks:
+            if path:
+                skipped.append(path)
+            continue
+        
+        kept.append(''.join(header_lines) + ''.join(review_hunks))
+    
+    minimized = ''.join(kept)
+    stats = {
+        'files_skipped': skipped,
+        'bytes_saved': len(diff.encode('utf-8')) - len(minimized.encode('utf-8')),
+        'tokens_saved': estimate_tokens(diff) - estimate_tokens(minimized),
+    }
+    return minimized, stats
+
+
+def _is_generated_file(path: str) -> bool:
+    """Check for lockfiles, minified bundles and vendored code."""
+    name = path.rsplit('/', 1)[-1]
+    if name in LOCKFILE_NAMES:
+        return True
+    if name.endswith(GENERATED_SUFFIXES):
+        return True
+    return any(part in VENDORED_DIRS for part in path.split('/')[:-1])
+
+
+def _is_binary(header_lines: List[str]) -> bool:
+    """Check whether a file header describes a binary change."""
+    return any(
+        line.startswith('Binary files ') or line.startswith('GIT binary patch')
+        for line in header_lines
+    )
+
+
+def _collapsed_header(header_lines: List[str], note: Optional[str]) -> str:
+    """Reduce a file header to its ``diff --git`` and rename lines plus a note."""
+    lines = [
+        line for line in header_lines
+        if line.startswith(('diff --git ', 'rename from ', 'rename to ', 'new file', 'deleted file'))
+    ]
+    if note:
+        lines.append(f"{note}\n")
+    return ''.join(lines)
+
+
+def _is_whitespace_only(hunk: str) -> bool:
+    """Check whether a hunk's changes differ only in whitespace."""
+    removed: List[str] = []
+    added: List[str] = []
+    
+    for line in hunk.splitlines()[1:]:
+        if line.startswith('-'):
+            removed.append(''.join(line[1:].split()))
+        elif line.startswith('+'):
+            added.append(''.join(line[1:].split()))
+    
+    removed = [line for line in removed if line]
+    added = [line for line in added if line]
+    return removed == added
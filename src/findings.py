@@ -0,0 +1,267 @@
+"""
+Typed review findings and their Markdown rendering.
+"""
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Report sections in the order the prompt asks for them
+REVIEW_SECTIONS = [
+    ("critical", "## 🔴 Critical Issues"),
+    ("warning", "## 🟡 Warnings"),
+    ("suggestion", "## 🟢 Suggestions"),
+    ("positive", "## ✅ Positive Notes"),
+]
+SEVERITIES = [key for key, _ in REVIEW_SECTIONS]
+SUMMARY_HEADING = "## 🔍 Summary"
+
+# Keys used by the API response and the GitHub comment formatter
+SECTION_KEYS = {
+    "critical": "critical",
+    "warning": "warnings",
+    "suggestion": "suggestions",
+    "positive": "positive",
+}
+
+# JSON schema passed to Gemini as response_schema
+REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "severity": {"type": "string", "enum": SEVERITIES},
+                    "file": {"type": "string", "nullable": True},
+                    "line": {"type": "integer", "nullable": True},
+                    "message": {"type": "string"},
+                },
+                "required": ["severity", "message"],
+            },
+        },
+    },
+    "required": ["findings"],
+}
+
+ITEM_PREFIX_RE = re.compile(r'^\*\*(?P<file>[^*:]+?)(?::(?P<line>\d+))?\*\*:\s*(?P<message>.*)$')
+
+
+@dataclass
+class Finding:
+    """A single review finding."""
+
+    severity: str
+    message: str
+    file: Optional[str] = None
+    line: Optional[int] = None
+
+    def location(self) -> str:
+        """Format the file and line, e.g. ``src/app.py:42``."""
+        if not self.file:
+            return ""
+        return f"{self.file}:{self.line}" if self.line else self.file
+
+    def to_item(self) -> str:
+        """Format as a single report item (without the bullet)."""
+        location = self.location()
+        return f"**{location}**: {self.message}" if location else self.message
+
+
+@dataclass
+class ReviewResult:
+    """Structured review: findings plus an optional summary."""
+
+    findings: List[Finding] = field(default_factory=list)
+    summary: str = ""
+    failed_files: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, text: str, default_file: Optional[str] = None) -> "ReviewResult":
+        """
+        Build a result from the model's JSON output.
+
+        Args:
+            text: JSON text following ``REVIEW_SCHEMA``
+            default_file: File to attribute findings without one to
+
+        Returns:
+            Parsed review result
+
+        Raises:
+            ValueError: If the text is not valid review JSON
+        """
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`").split("\n", 1)[-1]
+
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid review JSON: {e}") from e
+
+        if not isinstance(data, dict):
+            raise ValueError("Invalid review JSON: expected an object")
+
+        result = cls.from_dict(data)
+        if default_file:
+            for finding in result.findings:
+                finding.file = finding.file or default_file
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReviewResult":
+        """Build a result from a dict (as produced by ``to_dict``)."""
+        findings = []
+        for item in data.get("findings") or []:
+            severity = str(item.get("severity", "")).lower()
+            message = str(item.get("message", "")).strip()
+            if severity not in SEVERITIES or not message:
+                continue
+            line = item.get("line")
+            findings.append(Finding(
+                severity=severity,
+                message=message,
+                file=item.get("file") or None,
+                line=int(line) if isinstance(line, (int, float)) and line > 0 else None,
+            ))
+
+        return cls(
+            findings=findings,
+            summary=str(data.get("summary") or "").strip(),
+            failed_files=list(data.get("failed_files") or []),
+        )
+
+    @classmethod
+    def from_markdown(cls, text: str) -> "ReviewResult":
+        """
+        Parse a Markdown review (streamed or legacy output) in one pass.
+
+        Args:
+            text: Review with the standard severity headings
+
+        Returns:
+            Parsed review result
+        """
+        findings: List[Finding] = []
+        summary_lines: List[str] = []
+        current: Optional[str] = None
+        item: Optional[str] = None
+
+        def flush():
+            if item and current in SEVERITIES and not item.lower().startswith("none"):
+                findings.append(_finding_from_item(current, item))
+
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if line.startswith('#'):
+                flush()
+                item = None
+                current = section_for_heading(line)
+                continue
+
+            if current == "summary":
+                if line:
+                    summary_lines.append(line)
+            elif line.startswith(('-', '*')) and not line.startswith('**'):
+                flush()
+                item = line[1:].strip()
+            elif line and item is not None:
+                item += " " + line
+
+        flush()
+        return cls(findings=findings, summary=" ".join(summary_lines))
+
+    @classmethod
+    def merge(cls, results: List["ReviewResult"]) -> "ReviewResult":
+        """Combine results from several requests into one."""
+        merged = cls()
+        summaries = []
+        for result in results:
+            merged.findings.extend(result.findings)
+            merged.failed_files.extend(f for f in result.failed_files if f not in merged.failed_files)
+            if result.summary:
+                summaries.append(result.summary)
+        merged.summary = " ".join(summaries)
+        return merged
+
+    def by_severity(self, severity: str) -> List[Finding]:
+        """Get findings of one severity."""
+        return [f for f in self.findings if f.severity == severity]
+
+    def counts(self) -> Dict[str, int]:
+        """Count findings per severity."""
+        return {severity: len(self.by_severity(severity)) for severity in SEVERITIES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "summary": self.summary,
+            "findings": [asdict(f) for f in self.findings],
+            "failed_files": list(self.failed_files),
+        }
+
+    def to_sections(self) -> Dict[str, Any]:
+        """
+        Group formatted items by section, as used by the API response and
+        the GitHub comment formatter.
+        """
+        sections: Dict[str, Any] = {
+            SECTION_KEYS[severity]: [f.to_item() for f in self.by_severity(severity)]
+            for severity in SEVERITIES
+        }
+        sections["summary"] = self.summary
+        return sections
+
+    def to_markdown(self) -> str:
+        """Render the standard Markdown report."""
+        parts = []
+
+        if self.summary:
+            parts.extend([SUMMARY_HEADING, self.summary, ""])
+
+        for severity, heading in REVIEW_SECTIONS:
+            items = self.by_severity(severity)
+            parts.append(heading)
+            parts.append("\n".join(f"- {f.to_item()}" for f in items) if items else "- None")
+            parts.append("")
+
+        if self.failed_files:
+            parts.append("## ⚠️ Files Not Reviewed")
+            parts.extend(f"- {path}" for path in self.failed_files)
+            parts.append("")
+
+        return "\n".join(parts)
+
+
+def section_for_heading(heading: str) -> Optional[str]:
+    """Map a Markdown heading to a section key."""
+    lowered = heading.lower()
+    if "🔴" in heading or "critical" in lowered:
+        return "critical"
+    if "🟡" in heading or "warning" in lowered:
+        return "warning"
+    if "🟢" in heading or "suggestion" in lowered:
+        return "suggestion"
+    if "✅" in heading or "positive" in lowered:
+        return "positive"
+    if "summary" in lowered:
+        return "summary"
+    return None
+
+
+def _finding_from_item(severity: str, item: str) -> Finding:
+    """Turn a report item (optionally prefixed with ``**file:line**:``) into a finding."""
+    match = ITEM_PREFIX_RE.match(item)
+    if not match:
+        return Finding(severity=severity, message=item)
+
+    line = match.group("line")
+    return Finding(
+        severity=severity,
+        message=match.group("message"),
+        file=match.group("file"),
+        line=int(line) if line else None,
+    )
@@ -2,32 +2,150 @@
 LLM client for interacting with Google Gemini API.
 Includes retry logic, caching, and comprehensive error handling.
 """
+import asyncio
+import contextlib
+import json
 import logging
 import os
-from typing import Optional
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
 import google.generativeai as genai
 
+from src.diff_utils import (
+    estimate_tokens,
+    get_file_path,
+    pack_diff,
+    split_diff_by_file,
+    split_oversized_file,
+)
+from src.findings import REVIEW_SCHEMA, REVIEW_SECTIONS, ReviewResult, section_for_heading
+from src.languages import LANGUAGE_CONFIGS
 from src.utils.cache import ReviewCache
-from src.utils.retry import RateLimitError, ReviewError, TimeoutError, retry_with_backoff
+from src.utils.singleflight import SingleFlight, file_lease
+from src.utils.retry import (
+    RateLimitError,
+    ReviewError,
+    TimeoutError,
+    async_retry_with_backoff,
+    retry_with_backoff,
+)
 
 logger = logging.getLogger(__name__)
 
+# Input context window per model, in tokens
+MODEL_CONTEXT_TOKENS = {
+    "gemini-2.5-pro": 1_048_576,
+    "gemini-2.5-flash": 1_048_576,
+    "gemini-2.5-flash-lite": 1_048_576,
+    "gemini-2.0-flash": 1_048_576,
+    "gemini-1.5-pro": 2_097_152,
+    "gemini-1.5-flash": 1_048_576,
+}
+DEFAULT_CONTEXT_TOKENS = 32_768
+
+# Tokens kept free for the model's answer
+OUTPUT_RESERVE_TOKENS = 8_192
+
+# Changed-code patterns that send a diff straight to the strong model
+RISK_PATTERNS = [
+    r"\b(auth|login|logout|password|passwd|credential|secret|token|jwt|oauth|session|permission)",
+    r"\b(crypt|hmac|hashlib|signature|private_key)",
+    r"\b(SELECT\s+.+\s+FROM|INSERT\s+INTO|UPDATE\s+\w+\s+SET|DELETE\s+FROM|DROP\s+TABLE)\b",
+    r"\.(execute|executemany|raw)\(",
+] + [
+    issue["pattern"]
+    for language in LANGUAGE_CONFIGS.values()
+    for issue in language["common_issues"]
+    if issue["severity"] == "critical"
+]
+
+# Process-wide pool of Gemini models keyed by (api key, model, generation config)
+_model_pool: Dict[Tuple[str, str, str], Any] = {}
+_model_pool_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+
+# Identical reviews already running in this process are shared, not repeated
+_in_flight = SingleFlight()
+
+REVIEW_PROMPT = """
+You are an expert code reviewer. Analyze this git diff and provide a comprehensive code review.
+
+Categorize your findings into sections:
+
+## 🔴 Critical Issues
+- Security vulnerabilities (SQL injection, XSS, hardcoded secrets)
+- Logic errors that will cause bugs
+- Breaking changes
+
+## 🟡 Warnings
+- Code smells
+- Potential performance issues
+- Missing error handling
+
+## 🟢 Suggestions
+- Best practice improvements
+- Refactoring opportunities
+- Performance optimizations
+
+## ✅ Positive Notes
+- Good practices
+- Well-written code
+- Clever solutions
+
+GIT DIFF:
+```diff
+{diff}
+```
+"""
+
+STRUCTURED_PROMPT = """
+You are an expert code reviewer. Analyze this git diff and report your findings as JSON.
+
+Use these severities:
+- critical: security vulnerabilities, logic errors that will cause bugs, breaking changes
+- warning: code smells, potential performance issues, missing error handling
+- suggestion: best practice improvements, refactoring opportunities, optimizations
+- positive: good practices, well-written code, clever solutions
+
+For every finding give the file path as it appears in the diff and the line
+number in the new version of the file when it refers to a specific line.
+Add a one or two sentence summary of the change.
+
+GIT DIFF:
+```diff
+{diff}
+```
+"""
+
 
 def analyze_code_diff(
     diff: str,
     model_name: str = "gemini-2.5-flash",
     use_cache: bool = True,
-    timeout: Optional[int] = None
+    timeout: Optional[int] = None,
+    parallel: bool = False,
+    max_workers: int = 4,
+    max_input_tokens: Optional[int] = None,
+    generation_config: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Analyze a code diff using Google Gemini AI.
     
+    Diffs larger than the model's token budget are packed into as few
+    requests as fit and reviewed concurrently.
+    
     Args:
         diff: Git diff string to analyze
         model_name: Gemini model to use
         use_cache: Whether to use caching (default: True)
         timeout: Optional timeout in seconds
+        parallel: Review each file in a separate request on a worker pool
+        max_workers: Maximum number of concurrent requests
+        max_input_tokens: Token budget per request (default: model context)
+        generation_config: Optional generation settings (e.g. temperature)
         
     Returns:
         AI-generated review as markdown string
@@ -37,39 +155,709 @@ def analyze_code_diff(
         RateLimitError: If API rate limit exceeded
         TimeoutError: If request times out
     """
-    # Check for API key
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ReviewError(
-            "GEMINI_API_KEY environment variable not set. "
-            "Get one at: https://aistudio.google.com/app/apikey"
+    api_key = _get_api_key()
+    
+    budget = get_token_budget(model_name, max_input_tokens)
+    chunks = _plan_chunks(diff, budget, parallel)
+    
+    if len(chunks) > 1:
+        return _analyze_chunks(
+            chunks, model_name, use_cache, timeout, max_workers, budget,
+            generation_config
         )
     
-    # Check cache if enabled
+    return _review_request(diff, model_name, api_key, use_cache, timeout, generation_config)
+
+
+def analyze_code_diff_structured(
+    diff: str,
+    model_name: str = "gemini-2.5-flash",
+    use_cache: bool = True,
+    timeout: Optional[int] = None,
+    parallel: bool = False,
+    max_workers: int = 4,
+    max_input_tokens: Optional[int] = None,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> ReviewResult:
+    """
+    Analyze a code diff and return typed findings.
+    
+    The model is asked for JSON constrained by ``REVIEW_SCHEMA`` (severity,
+    file, line, message), so callers get exact data without parsing
+    Markdown. Use ``ReviewResult.to_markdown`` to render the report.
+    
+    Args and raised errors are the same as ``analyze_code_diff``.
+    
+    Returns:
+        Structured review result
+    """
+    api_key = _get_api_key()
+    
+    budget = get_token_budget(model_name, max_input_tokens)
+    chunks = _plan_chunks(diff, budget, parallel)
+    
+    def review_chunk(chunk: str) -> Tuple[List[str], Optional[ReviewResult], Optional[Exception]]:
+        paths = _chunk_paths(chunk)
+        try:
+            text = _review_request(
+                chunk, model_name, api_key, use_cache, timeout, generation_config,
+                structured=True
+            )
+            return paths, _parse_structured_review(text, paths), None
+        except Exception as e:
+            return paths, None, e
+    
+    if len(chunks) == 1:
+        results = [review_chunk(chunks[0])]
+    else:
+        workers = max(1, min(max_workers, len(chunks)))
+        logger.info(f"Reviewing {len(chunks)} diff chunks with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(review_chunk, chunks))
+    
+    return _merge_structured_results(results)
+
+
+async def analyze_code_diff_async(
+    diff: str,
+    model_name: str = "gemini-2.5-flash",
+    use_cache: bool = True,
+    timeout: Optional[int] = None,
+    parallel: bool = False,
+    max_workers: int = 4,
+    max_input_tokens: Optional[int] = None,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Analyze a code diff without blocking the event loop.
+    
+    Asyncio counterpart of ``analyze_code_diff`` for the FastAPI app: the
+    model call is awaited natively, backoff uses ``asyncio.sleep`` and cache
+    file I/O runs in a worker thread. Chunked diffs are reviewed with
+    ``asyncio.gather`` bounded by ``max_workers``.
+    
+    Args and return value are the same as ``analyze_code_diff``.
+    """
+    api_key = _get_api_key()
+    
+    budget = get_token_budget(model_name, max_input_tokens)
+    chunks = _plan_chunks(diff, budget, parallel)
+    
+    if len(chunks) == 1:
+        return await _review_request_async(
+            diff, model_name, api_key, use_cache, timeout, generation_config
+        )
+    
+    async def review_chunk(chunk: str) -> str:
+        return await _review_request_async(
+            chunk, model_name, api_key, use_cache, timeout, generation_config
+        )
+    
+    results = await _gather_chunks(chunks, review_chunk, max_workers)
+    return _merge_chunk_results(results)
+
+
+async def analyze_code_diff_structured_async(
+    diff: str,
+    model_name: str = "gemini-2.5-flash",
+    use_cache: bool = True,
+    timeout: Optional[int] = None,
+    parallel: bool = False,
+    max_workers: int = 4,
+    max_input_tokens: Optional[int] = None,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> ReviewResult:
+    """
+    Asyncio counterpart of ``analyze_code_diff_structured``.
+    
+    Args and return value are the same as ``analyze_code_diff_structured``.
+    """
+    api_key = _get_api_key()
+    
+    budget = get_token_budget(model_name, max_input_tokens)
+    chunks = _plan_chunks(diff, budget, parallel)
+    
+    async def review_chunk(chunk: str) -> ReviewResult:
+        text = await _review_request_async(
+            chunk, model_name, api_key, use_cache, timeout, generation_config,
+            structured=True
+        )
+        return _parse_structured_review(text, _chunk_paths(chunk))
+    
+    results = await _gather_chunks(chunks, review_chunk, max_workers)
+    return _merge_structured_results(results)
+
+
+def stream_code_diff(
+    diff: str,
+    model_name: str = "gemini-2.5-flash",
+    use_cache: bool = True,
+    max_input_tokens: Optional[int] = None,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Analyze a code diff and yield the review as the model produces it.
+    
+    Cached reviews are yielded in one piece. Diffs that need more than one
+    request are reviewed with ``analyze_code_diff`` and yielded merged, since
+    per-chunk output cannot be merged incrementally. The complete review is
+    cached only if the stream is consumed to the end, so callers may stop
+    early without polluting the cache.
+    
+    Args:
+        diff: Git diff string to analyze
+        model_name: Gemini model to use
+        use_cache: Whether to use caching (default: True)
+        max_input_tokens: Token budget per request (default: model context)
+        generation_config: Optional generation settings (e.g. temperature)
+        
+    Yields:
+        Review text chunks (markdown)
+        
+    Raises:
+        ReviewError: If API key not set or review fails
+        RateLimitError: If API rate limit exceeded
+        TimeoutError: If request times out
+    """
+    api_key = _get_api_key()
+    
+    if len(pack_diff(diff, get_token_budget(model_name, max_input_tokens))) > 1:
+        yield analyze_code_diff(
+            diff, model_name, use_cache,
+            max_input_tokens=max_input_tokens,
+            generation_config=generation_config
+        )
+        return
+    
     if use_cache:
         cache = ReviewCache()
         cache_key = cache.get_cache_key(diff, model_name)
         cached_review = cache.get(cache_key)
         
+        if cached_review:
+            logger.info("Using cached review")
+            yield cached_review.get('review', '')
+            return
+    
+    parts: List[str] = []
+    try:
+        response = _open_gemini_stream(diff, model_name, api_key, generation_config)
+        for chunk in response:
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield text
+    except (RateLimitError, TimeoutError, ReviewError):
+        raise
+    except Exception as e:
+        logger.error(f"Streaming review failed: {e}")
+        raise _classify_api_error(e) from e
+    
+    if use_cache:
+        cache.set(cache_key, {'review': "".join(parts), 'model': model_name})
+
+
+def analyze_with_routing(
+    diff: str,
+    routing: Dict[str, Any],
+    **kwargs: Any
+) -> ReviewResult:
+    """
+    Review a diff with the cheapest model that is good enough.
+    
+    Small, low-risk diffs go to ``routing['fast_model']``. Diffs that are
+    large or touch risky code go straight to ``routing['strong_model']``,
+    and a fast review that reports critical issues is re-run on the strong
+    model (when ``escalate_on_critical`` is set) so the final report comes
+    from the larger model.
+    
+    Args:
+        diff: Git diff string to analyze
+        routing: Routing settings (see ``ConfigManager.get_routing_config``)
+        **kwargs: Passed through to ``analyze_code_diff_structured``
+        
+    Returns:
+        Structured review result
+    """
+    model_name, reasons = choose_model(diff, routing)
+    result = analyze_code_diff_structured(diff, model_name, **kwargs)
+    
+    if (
+        model_name != routing['strong_model']
+        and routing.get('escalate_on_critical', True)
+        and result.counts()['critical'] > 0
+    ):
+        logger.info(f"Escalating review to {routing['strong_model']}: fast pass found critical issues")
+        result = analyze_code_diff_structured(diff, routing['strong_model'], **kwargs)
+    
+    return result
+
+
+def choose_model(diff: str, routing: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """
+    Pick the model for a diff from its size and risk heuristics.
+    
+    Args:
+        diff: Git diff string
+        routing: Routing settings
+        
+    Returns:
+        Tuple of (model name, reasons for using the strong model)
+    """
+    reasons = assess_diff_risk(diff, routing.get('risk_patterns') or [])
+    
+    tokens = estimate_tokens(diff)
+    if tokens > routing.get('max_fast_tokens', 4000):
+        reasons.append(f"large diff (~{tokens} tokens)")
+    
+    if reasons:
+        logger.info(f"Routing to {routing['strong_model']}: {'; '.join(reasons)}")
+        return routing['strong_model'], reasons
+    
+    logger.info(f"Routing to {routing['fast_model']}: small low-risk diff")
+    return routing['fast_model'], reasons
+
+
+def assess_diff_risk(diff: str, extra_patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Check changed lines against the risk patterns.
+    
+    Only added and removed lines are scanned; unchanged context does not
+    make a diff risky.
+    
+    Args:
+        diff: Git diff string
+        extra_patterns: Additional regex patterns from configuration
+        
+    Returns:
+        List of matched patterns (empty if the diff looks low-risk)
+    """
+    changed = "\n".join(
+        line[1:] for line in diff.splitlines()
+        if line[:1] in ('+', '-') and not line.startswith(('+++', '---'))
+    )
+    
+    return [
+        f"matches {pattern}"
+        for pattern in RISK_PATTERNS + list(extra_patterns or [])
+        if re.search(pattern, changed, re.IGNORECASE)
+    ]
+
+
+def get_token_budget(model_name: str, max_input_tokens: Optional[int] = None) -> int:
+    """
+    Get the number of diff tokens that fit in a single request.
+    
+    Args:
+        model_name: Model to use
+        max_input_tokens: Optional configured cap on input tokens
+        
+    Returns:
+        Token budget for the diff, excluding prompt and output reserve
+    """
+    context = MODEL_CONTEXT_TOKENS.get(model_name, DEFAULT_CONTEXT_TOKENS)
+    if max_input_tokens:
+        context = min(context, max_input_tokens)
+    
+    prompt_tokens = estimate_tokens(REVIEW_PROMPT)
+    return max(context - prompt_tokens - OUTPUT_RESERVE_TOKENS, 1024)
+
+
+def _analyze_chunks(
+    chunks: List[str],
+    model_name: str,
+    use_cache: bool,
+    timeout: Optional[int],
+    max_workers: int,
+    max_input_tokens: int,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Review diff chunks concurrently and merge the results.
+    
+    A failure on one chunk does not discard the reviews of the others;
+    the files of failed chunks are listed in the merged report instead.
+    
+    Args:
+        chunks: Diff chunks, each fitting in a single request
+        model_name: Model to use
+        use_cache: Whether to use caching
+        timeout: Timeout in seconds for each request
+        max_workers: Size of the worker pool
+        max_input_tokens: Token budget per request
+        generation_config: Optional generation settings
+        
+    Returns:
+        Merged review as markdown string
+        
+    Raises:
+        ReviewError: If every chunk failed to review
+    """
+    def review_chunk(chunk: str) -> Tuple[List[str], Optional[str], Optional[Exception]]:
+        paths = _chunk_paths(chunk)
+        try:
+            review = analyze_code_diff(
+                chunk, model_name, use_cache, timeout,
+                max_input_tokens=max_input_tokens,
+                generation_config=generation_config
+            )
+            return paths, review, None
+        except Exception as e:
+            return paths, None, e
+    
+    workers = max(1, min(max_workers, len(chunks)))
+    logger.info(f"Reviewing {len(chunks)} diff chunks with {workers} workers")
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(review_chunk, chunks))
+    
+    return _merge_chunk_results(results)
+
+
+def _review_request(
+    diff: str,
+    model_name: str,
+    api_key: str,
+    use_cache: bool,
+    timeout: Optional[int],
+    generation_config: Optional[Dict[str, Any]],
+    structured: bool = False
+) -> str:
+    """
+    Run one review request through the cache, single-flight and retry layers.
+    
+    Returns:
+        Raw model output (Markdown, or JSON when ``structured``)
+    """
+    # Check cache if enabled
+    if use_cache:
+        cache = ReviewCache()
+        cache_key = cache.get_cache_key(diff, _cache_model_key(model_name, structured))
+        cached_review = cache.get(cache_key)
+        
         if cached_review:
             logger.info("Using cached review")
             return cached_review.get('review', '')
     
+    def call_api() -> str:
+        if not use_cache:
+            return _call_gemini_api(
+                diff, model_name, api_key, timeout,
+                generation_config=generation_config, structured=structured
+            )
+        
+        with _shared_lease(cache, cache_key):
+            # Another process may have finished this review while we waited
+            cached = cache.get(cache_key)
+            if cached:
+                return cached.get('review', '')
+            
+            review = _call_gemini_api(
+                diff, model_name, api_key, timeout,
+                generation_config=generation_config, structured=structured
+            )
+            
+            # Cache the result
+            cache.set(cache_key, {'review': review, 'model': model_name})
+            return review
+    
     # Call API with retry logic
     try:
-        review = _call_gemini_api(diff, model_name, api_key, timeout)
+        if use_cache:
+            return _in_flight.do(cache_key, call_api)
+        return call_api()
+        
+    except Exception as e:
+        logger.error(f"Review failed: {e}")
+        raise ReviewError(f"Failed to analyze code: {e}") from e
+
+
+async def _review_request_async(
+    diff: str,
+    model_name: str,
+    api_key: str,
+    use_cache: bool,
+    timeout: Optional[int],
+    generation_config: Optional[Dict[str, Any]],
+    structured: bool = False
+) -> str:
+    """Asyncio counterpart of ``_review_request``."""
+    if use_cache:
+        cache = ReviewCache()
+        cache_key = cache.get_cache_key(diff, _cache_model_key(model_name, structured))
+        cached_review = await asyncio.to_thread(cache.get, cache_key)
+        
+        if cached_review:
+            logger.info("Using cached review")
+            return cached_review.get('review', '')
+    
+    async def call_api() -> str:
+        review = await _call_gemini_api_async(
+            diff, model_name, api_key, timeout,
+            generation_config=generation_config, structured=structured
+        )
         
-        # Cache the result
         if use_cache:
-            cache.set(cache_key, {'review': review, 'model': model_name})
+            await asyncio.to_thread(
+                cache.set, cache_key, {'review': review, 'model': model_name}
+            )
         
         return review
+    
+    try:
+        if use_cache:
+            return await _in_flight.do_async(cache_key, call_api)
+        return await call_api()
         
     except Exception as e:
         logger.error(f"Review failed: {e}")
         raise ReviewError(f"Failed to analyze code: {e}") from e
 
 
+async def _gather_chunks(
+    chunks: List[str],
+    review_chunk: Callable[[str], Awaitable[Any]],
+    max_workers: int
+) -> List[Tuple[List[str], Optional[Any], Optional[Exception]]]:
+    """Review chunks concurrently, collecting (paths, result, error) per chunk."""
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    
+    async def run(chunk: str) -> Tuple[List[str], Optional[Any], Optional[Exception]]:
+        paths = _chunk_paths(chunk)
+        async with semaphore:
+            try:
+                return paths, await review_chunk(chunk), None
+            except Exception as e:
+                return paths, None, e
+    
+    if len(chunks) > 1:
+        logger.info(f"Reviewing {len(chunks)} diff chunks concurrently")
+    return list(await asyncio.gather(*(run(chunk) for chunk in chunks)))
+
+
+def _cache_model_key(model_name: str, structured: bool) -> str:
+    """Model component of the cache key; JSON and Markdown output differ."""
+    return f"{model_name}:json" if structured else model_name
+
+
+def _parse_structured_review(text: str, paths: List[str]) -> ReviewResult:
+    """Parse JSON model output, falling back to Markdown if the schema was ignored."""
+    default_file = paths[0] if len(set(paths)) == 1 and paths[0] != "unknown" else None
+    try:
+        return ReviewResult.from_json(text, default_file=default_file)
+    except ValueError as e:
+        logger.warning(f"Model returned non-JSON review, parsing as Markdown: {e}")
+        return ReviewResult.from_markdown(text)
+
+
+def _merge_structured_results(
+    results: List[Tuple[List[str], Optional[ReviewResult], Optional[Exception]]]
+) -> ReviewResult:
+    """
+    Merge (paths, result, error) tuples from structured chunk reviews.
+    
+    Raises:
+        ReviewError: If every chunk failed to review
+    """
+    reviews = [result for _, result, _ in results if result is not None]
+    failures = [(paths, error) for paths, _, error in results if error is not None]
+    
+    if not reviews:
+        error = failures[0][1]
+        if isinstance(error, ReviewError):
+            raise error
+        raise ReviewError(f"Failed to analyze code: {error}") from error
+    
+    merged = ReviewResult.merge(reviews)
+    for paths, error in failures:
+        logger.error(f"Review failed for {', '.join(paths)}: {error}")
+        merged.failed_files.extend(p for p in paths if p not in merged.failed_files)
+    
+    return merged
+
+
+def _shared_lease(cache: ReviewCache, cache_key: str):
+    """
+    Lease a review key across processes when shared locks are enabled.
+    
+    Set ``CODE_REVIEWER_SHARED_LOCKS=1`` so uvicorn workers or CI jobs that
+    share a cache directory wait for each other instead of reviewing the
+    same diff concurrently.
+    """
+    if os.environ.get("CODE_REVIEWER_SHARED_LOCKS", "").lower() in ("1", "true", "yes"):
+        return file_lease(cache.cache_dir / "locks" / f"{cache_key}.lock")
+    return contextlib.nullcontext(False)
+
+
+def _get_api_key() -> str:
+    """Get the Gemini API key from the environment."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ReviewError(
+            "GEMINI_API_KEY environment variable not set. "
+            "Get one at: https://aistudio.google.com/app/apikey"
+        )
+    return api_key
+
+
+def _plan_chunks(diff: str, budget: int, parallel: bool) -> List[str]:
+    """Split a diff into the chunks that are sent as separate requests."""
+    if parallel:
+        return [
+            piece
+            for file_diff in split_diff_by_file(diff)
+            for piece in split_oversized_file(file_diff, budget)
+        ]
+    return pack_diff(diff, budget)
+
+
+def _chunk_paths(chunk: str) -> List[str]:
+    """List the files contained in a diff chunk."""
+    return [get_file_path(f) or "unknown" for f in split_diff_by_file(chunk)]
+
+
+def _merge_chunk_results(
+    results: List[Tuple[List[str], Optional[str], Optional[Exception]]]
+) -> str:
+    """
+    Merge (paths, review, error) results from chunked requests.
+    
+    Raises:
+        ReviewError: If every chunk failed to review
+    """
+    reviews = [
+        (paths[0] if len(set(paths)) == 1 else None, review)
+        for paths, review, _ in results if review is not None
+    ]
+    failures = [(paths, error) for paths, _, error in results if error is not None]
+    
+    if not reviews:
+        raise ReviewError(f"Failed to analyze code: {failures[0][1]}") from failures[0][1]
+    
+    failed_files: List[str] = []
+    for paths, error in failures:
+        logger.error(f"Review failed for {', '.join(paths)}: {error}")
+        failed_files.extend(p for p in paths if p not in failed_files)
+    
+    return merge_reviews(reviews, failed_files=failed_files)
+
+
+def merge_reviews(
+    reviews: List[Tuple[Optional[str], str]],
+    failed_files: Optional[List[str]] = None
+) -> str:
+    """
+    Merge per-chunk markdown reviews into a single report.
+    
+    Items are grouped under the standard severity sections. Bullets from
+    single-file chunks are prefixed with the file they refer to, so the
+    merged report can be parsed exactly like a single-request review.
+    
+    Args:
+        reviews: List of (file path or None, review markdown) tuples
+        failed_files: Files that could not be reviewed
+        
+    Returns:
+        Merged review as markdown string
+    """
+    merged: Dict[str, List[str]] = {key: [] for key, _ in REVIEW_SECTIONS}
+    
+    for path, review in reviews:
+        for key, lines in _split_sections(review).items():
+            for line in lines:
+                stripped = line.strip()
+                if stripped.startswith(('-', '*')):
+                    item = stripped[1:].strip()
+                    if item and not item.lower().startswith("none"):
+                        prefix = f"**{path}**: " if path else ""
+                        merged[key].append(f"- {prefix}{item}")
+                elif stripped and merged[key]:
+                    merged[key].append(f"  {stripped}")
+    
+    parts = []
+    for key, heading in REVIEW_SECTIONS:
+        parts.append(heading)
+        parts.append("\n".join(merged[key]) if merged[key] else "- None")
+        parts.append("")
+    
+    if failed_files:
+        parts.append("## ⚠️ Files Not Reviewed")
+        parts.extend(f"- {path}" for path in failed_files)
+        parts.append("")
+    
+    return "\n".join(parts)
+
+
+def _split_sections(review: str) -> Dict[str, List[str]]:
+    """Group the lines of a markdown review by severity section."""
+    sections: Dict[str, List[str]] = {key: [] for key, _ in REVIEW_SECTIONS}
+    current: Optional[str] = None
+    
+    for line in review.splitlines():
+        if line.lstrip().startswith('#'):
+            current = section_for_heading(line)
+            continue
+        if current in sections:
+            sections[current].append(line)
+    
+    return sections
+
+
+def get_gemini_model(
+    api_key: str,
+    model_name: str,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Get a shared Gemini model, creating it on first use.
+    
+    Models are cached for the lifetime of the process so the CLI, the API
+    and the webhook handler reuse one client and its transport instead of
+    rebuilding them on every request and retry. ``genai.configure`` is only
+    called again when the API key changes.
+    
+    Args:
+        api_key: Gemini API key
+        model_name: Model to use
+        generation_config: Optional generation settings
+        
+    Returns:
+        Configured ``genai.GenerativeModel``
+    """
+    global _configured_api_key
+    
+    config_key = json.dumps(generation_config or {}, sort_keys=True)
+    pool_key = (api_key, model_name, config_key)
+    
+    model = _model_pool.get(pool_key)
+    if model is not None:
+        return model
+    
+    with _model_pool_lock:
+        model = _model_pool.get(pool_key)
+        if model is None:
+            if _configured_api_key != api_key:
+                genai.configure(api_key=api_key)
+                _configured_api_key = api_key
+            model = genai.GenerativeModel(
+                model_name,
+                generation_config=generation_config
+            )
+            _model_pool[pool_key] = model
+            logger.debug(f"Created Gemini model client for {model_name}")
+    
+    return model
+
+
+def clear_model_pool() -> None:
+    """Drop all pooled Gemini models (e.g. after rotating the API key)."""
+    global _configured_api_key
+    
+    with _model_pool_lock:
+        _model_pool.clear()
+        _configured_api_key = None
+
+
 @retry_with_backoff(
     max_attempts=3,
     base_delay=2.0,
@@ -79,7 +867,9 @@ def _call_gemini_api(
     diff: str,
     model_name: str,
     api_key: str,
-    timeout: Optional[int]
+    timeout: Optional[int],
+    generation_config: Optional[Dict[str, Any]] = None,
+    structured: bool = False
 ) -> str:
     """
     Internal function to call Gemini API with retry logic.
@@ -89,58 +879,115 @@ def _call_gemini_api(
         model_name: Model to use
         api_key: API key
         timeout: Timeout in seconds
+        generation_config: Optional generation settings
+        structured: Request JSON findings following ``REVIEW_SCHEMA``
         
     Returns:
-        Review text
+        Review text (JSON when ``structured``)
     """
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(model_name)
-    
-    prompt = f"""
-You are an expert code reviewer. Analyze this git diff and provide a comprehensive code review.
-
-Categorize your findings into sections:
-
-## 🔴 Critical Issues
-- Security vulnerabilities (SQL injection, XSS, hardcoded secrets)
-- Logic errors that will cause bugs
-- Breaking changes
-
-## 🟡 Warnings
-- Code smells
-- Potential performance issues
-- Missing error handling
-
-## 🟢 Suggestions
-- Best practice improvements
-- Refactoring opportunities
-- Performance optimizations
-
-## ✅ Positive Notes
-- Good practices
-- Well-written code
-- Clever solutions
-
-GIT DIFF:
-```diff
-{diff}
-```
-"""
+    prompt, generation_config = _build_request(diff, generation_config, structured)
+    model = get_gemini_model(api_key, model_name, generation_config)
     
     try:
         response = model.generate_content(prompt)
         return response.text
         
     except Exception as e:
-        error_msg = str(e).lower()
-        
-        # Detect rate limiting
-        if "rate" in error_msg or "quota" in error_msg or "429" in error_msg:
-            raise RateLimitError(f"API rate limit exceeded: {e}") from e
+        raise _classify_api_error(e) from e
+
+
+@async_retry_with_backoff(
+    max_attempts=3,
+    base_delay=2.0,
+    exceptions=(Exception,)
+)
+async def _call_gemini_api_async(
+    diff: str,
+    model_name: str,
+    api_key: str,
+    timeout: Optional[int],
+    generation_config: Optional[Dict[str, Any]] = None,
+    structured: bool = False
+) -> str:
+    """
+    Internal coroutine to call Gemini API with retry logic.
+    
+    Args:
+        diff: Code diff
+        model_name: Model to use
+        api_key: API key
+        timeout: Timeout in seconds
+        generation_config: Optional generation settings
+        structured: Request JSON findings following ``REVIEW_SCHEMA``
         
-        # Detect timeout
-        if "timeout" in error_msg or "deadline" in error_msg:
-            raise TimeoutError(f"API request timed out: {e}") from e
+    Returns:
+        Review text (JSON when ``structured``)
+    """
+    prompt, generation_config = _build_request(diff, generation_config, structured)
+    model = get_gemini_model(api_key, model_name, generation_config)
+    
+    try:
+        response = await model.generate_content_async(prompt)
+        return response.text
         
-        # Generic error
-        raise ReviewError(f"API error: {e}") from e
+    except Exception as e:
+        raise _classify_api_error(e) from e
+
+
+@retry_with_backoff(
+    max_attempts=3,
+    base_delay=2.0,
+    exceptions=(Exception,)
+)
+def _open_gemini_stream(
+    diff: str,
+    model_name: str,
+    api_key: str,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Start a streaming Gemini request with retry logic.
+    
+    Only opening the stream is retried; once chunks have been handed to
+    the caller a failure can no longer be retried transparently.
+    
+    Returns:
+        Iterable streaming response
+    """
+    model = get_gemini_model(api_key, model_name, generation_config)
+    
+    try:
+        return model.generate_content(REVIEW_PROMPT.format(diff=diff), stream=True)
+    except Exception as e:
+        raise _classify_api_error(e) from e
+
+
+def _build_request(
+    diff: str,
+    generation_config: Optional[Dict[str, Any]],
+    structured: bool
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Build the prompt and generation settings for a review request."""
+    if not structured:
+        return REVIEW_PROMPT.format(diff=diff), generation_config
+    
+    config = dict(generation_config or {})
+    config['response_mime_type'] = "application/json"
+    config['response_schema'] = REVIEW_SCHEMA
+    return STRUCTURED_PROMPT.format(diff=diff), config
+
+
+def _classify_api_error(error: Exception) -> Exception:
+    """Map a Gemini client exception to the reviewer's error types."""
+    error_msg = str(error).lower()
+    
+    # Detect rate limiting
+    if "rate" in error_msg or "quota" in error_msg or "429" in error_msg:
+        return RateLimitError(f"API rate limit exceeded: {error}")
+    
+    # Detect timeout
+    if "timeout" in error_msg or "deadline" in error_msg:
+        return TimeoutError(f"API request timed out: {error}")
+    
+    # Generic error
+    return ReviewError(f"API error: {error}")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import typer
 from rich.console import Console
 
@@ -7,7 +9,9 @@ console = Console()
 @app.command()
 def review(
     diff_type: str = typer.Option("staged", help="Type of changes: staged, uncommitted, last-commit"),
-    format: str = typer.Option("terminal", help="Output format: terminal, markdown, json")
+    format: str = typer.Option("terminal", help="Output format: terminal, markdown, json"),
+    parallel: Optional[bool] = typer.Option(None, "--parallel/--no-parallel", help="Review files in parallel requests (default: from config)"),
+    stream: bool = typer.Option(False, "--stream", help="Render the review progressively as it is generated (terminal format)")
 ):
     """
     Analyze changes in the current git repository.
@@ -15,10 +19,14 @@ def review(
     console.print("[bold green]🔍 Starting Code Review...[/bold green]")
     
     try:
+        if stream and format == "terminal":
+            _render_review_stream(diff_type)
+            return
+        
         from src.reviewer import run_review
         
         with console.status("[bold blue]Analyzing code with AI...[/bold blue]"):
-            report = run_review(diff_type=diff_type, output_format=format)
+            report = run_review(diff_type=diff_type, output_format=format, parallel=parallel)
         
         if format == "terminal":
             from rich.markdown import Markdown
@@ -39,6 +47,20 @@ def review(
         console.print(f"[bold red]❌ An error occurred:[/bold red] {e}")
         console.print("[dim]Tip: Make sure GEMINI_API_KEY is set and you're in a git repository.[/dim]")
 
+def _render_review_stream(diff_type: str):
+    """Render streamed review chunks as live-updating Markdown."""
+    from rich.live import Live
+    from rich.markdown import Markdown
+    
+    from src.reviewer import stream_review
+    
+    report = ""
+    with Live(Markdown(report), console=console, refresh_per_second=8, vertical_overflow="visible") as live:
+        for chunk in stream_review(diff_type=diff_type):
+            report += chunk
+            live.update(Markdown(report))
+
+
 @app.command()
 def config(api_key: str):
     """
@@ -1,13 +1,23 @@
+import logging
 import re
 import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .config import ConfigManager, CustomRulesEngine
 from .database import ReviewDatabase
+from .diff_utils import limit_diff_size, minimize_diff
 from .git_handler import get_last_commit_diff, get_staged_diff, get_uncommitted_diff
-from .llm_client import analyze_code_diff
+from .llm_client import analyze_code_diff, analyze_with_routing, choose_model, stream_code_diff
 
+logger = logging.getLogger(__name__)
 
-def run_review(diff_type: str = "staged", output_format: str = "terminal", save_to_db: bool = True):
+
+def run_review(
+    diff_type: str = "staged",
+    output_format: str = "terminal",
+    save_to_db: bool = True,
+    parallel: Optional[bool] = None
+):
     """
     Orchestrates the code review process.
     
@@ -15,12 +25,101 @@ def run_review(diff_type: str = "staged", output_format: str = "terminal", save_
         diff_type: Type of diff to review (staged, uncommitted, last-commit)
         output_format: Output format (terminal, markdown, json)
         save_to_db: Whether to save review to database
+        parallel: Review files in parallel requests (default: from config)
     """
     start_time = time.time()
     
     # Load configuration
     config = ConfigManager()
     
+    diff, notes, message = _prepare_diff(diff_type, config)
+    if message:
+        return message
+    
+    # Run AI review
+    if parallel is None:
+        parallel = config.is_parallel_enabled()
+    
+    routing = config.get_routing_config()
+    if routing.get('enabled'):
+        report = analyze_with_routing(
+            diff,
+            routing,
+            parallel=parallel,
+            max_workers=config.get_max_workers(),
+            **_model_options(config)
+        )
+    else:
+        report = analyze_code_diff(
+            diff,
+            config.get_model_name(),
+            parallel=parallel,
+            max_workers=config.get_max_workers(),
+            **_model_options(config)
+        )
+    
+    report += _report_footer(diff, notes, config)
+    
+    # Save to database
+    if save_to_db:
+        _save_review(diff_type, diff, report, time.time() - start_time)
+    
+    return report
+
+
+def stream_review(diff_type: str = "staged", save_to_db: bool = True) -> Iterator[str]:
+    """
+    Run a review and yield the report in chunks as the model produces them.
+    
+    The concatenated chunks equal the report ``run_review`` would return.
+    The review is only saved once the stream has been fully consumed.
+    
+    Args:
+        diff_type: Type of diff to review (staged, uncommitted, last-commit)
+        save_to_db: Whether to save review to database
+        
+    Yields:
+        Report text chunks
+    """
+    start_time = time.time()
+    config = ConfigManager()
+    
+    diff, notes, message = _prepare_diff(diff_type, config)
+    if message:
+        yield message
+        return
+    
+    # Streamed output cannot be escalated after the fact, so only route up front
+    model_name = config.get_model_name()
+    routing = config.get_routing_config()
+    if routing.get('enabled'):
+        model_name, _ = choose_model(diff, routing)
+    
+    parts: List[str] = []
+    for chunk in stream_code_diff(diff, model_name, **_model_options(config)):
+        parts.append(chunk)
+        yield chunk
+    
+    footer = _report_footer(diff, notes, config)
+    if footer:
+        parts.append(footer)
+        yield footer
+    
+    if save_to_db:
+        _save_review(diff_type, diff, "".join(parts), time.time() - start_time)
+
+
+def _prepare_diff(
+    diff_type: str,
+    config: ConfigManager
+) -> Tuple[str, Dict[str, Any], Optional[str]]:
+    """
+    Load the requested diff, strip noise and apply the configured size limit.
+    
+    Returns:
+        Tuple of (diff, notes for the report footer, message). ``message``
+        is set when there is nothing to review and should be returned as is.
+    """
     # Get the appropriate diff
     if diff_type == "staged":
         diff = get_staged_diff()
@@ -29,13 +128,60 @@ def run_review(diff_type: str = "staged", output_format: str = "terminal", save_
     elif diff_type == "last-commit":
         diff = get_last_commit_diff()
     else:
-        return f"Error: Invalid diff type '{diff_type}'"
+        return "", {}, f"Error: Invalid diff type '{diff_type}'"
     
     if not diff:
-        return f"No {diff_type} changes found to review."
+        return "", {}, f"No {diff_type} changes found to review."
     
-    # Run AI review
-    report = analyze_code_diff(diff, config.get_model_name())
+    notes: Dict[str, Any] = {}
+    
+    # Drop ignored/generated files and whitespace-only changes
+    if config.is_minimize_enabled():
+        diff, minimize_stats = minimize_diff(diff, config.should_review_file)
+        logger.info(
+            f"Pre-filter skipped {len(minimize_stats['files_skipped'])} files, "
+            f"saved {minimize_stats['bytes_saved']} bytes (~{minimize_stats['tokens_saved']} tokens)"
+        )
+        notes['minimize'] = minimize_stats
+        if not diff:
+            return "", notes, f"No {diff_type} changes left to review after filtering ignored files."
+    
+    # Enforce the configured size limit (whole files only)
+    diff, notes['oversized_files'] = limit_diff_size(diff, config.get_max_diff_size() * 1024)
+    if not diff:
+        return "", notes, (
+            f"Error: Every changed file exceeds max_diff_size ({config.get_max_diff_size()} KB)"
+        )
+    
+    return diff, notes, None
+
+
+def _model_options(config: ConfigManager) -> Dict[str, Any]:
+    """Model settings shared by the blocking and streaming review paths."""
+    return {
+        'max_input_tokens': config.get_max_input_tokens(),
+        'generation_config': config.get_generation_config() or None,
+    }
+
+
+def _report_footer(diff: str, notes: Dict[str, Any], config: ConfigManager) -> str:
+    """Build the report sections that do not come from the model."""
+    footer = ""
+    
+    if notes.get('oversized_files'):
+        footer += "\n\n## ⚠️ Skipped (max_diff_size exceeded)\n\n"
+        for path in notes['oversized_files']:
+            footer += f"- {path}\n"
+    
+    minimize_stats = notes.get('minimize')
+    if minimize_stats and minimize_stats['bytes_saved'] > 0:
+        footer += "\n\n## ✂️ Pre-filter\n\n"
+        footer += (
+            f"- Saved {minimize_stats['bytes_saved']} bytes "
+            f"(~{minimize_stats['tokens_saved']} tokens) before review\n"
+        )
+        if minimize_stats['files_skipped']:
+            footer += f"- Not reviewed: {', '.join(minimize_stats['files_skipped'])}\n"
     
     # Apply custom rules
     custom_rules = config.get_custom_rules()
@@ -44,30 +190,30 @@ def run_review(diff_type: str = "staged", output_format: str = "terminal", save_
         custom_findings = rules_engine.apply_rules(diff)
         
         if custom_findings:
-            report += "\n\n## 🎯 Custom Rules Findings\n\n"
+            footer += "\n\n## 🎯 Custom Rules Findings\n\n"
             for finding in custom_findings:
-                report += f"- {finding}\n"
+                footer += f"- {finding}\n"
     
-    # Save to database
-    if save_to_db:
-        duration = time.time() - start_time
-        db = ReviewDatabase()
-        
-        # Count issues by severity
-        critical_count = len(re.findall(r'🔴|Critical', report, re.IGNORECASE))
-        warning_count = len(re.findall(r'🟡|Warning', report, re.IGNORECASE))
-        suggestion_count = len(re.findall(r'🟢|Suggestion', report, re.IGNORECASE))
-        
-        review_data = {
-            'diff_type': diff_type,
-            'file_count': len(re.findall(r'diff --git', diff)),
-            'critical_count': critical_count,
-            'warning_count': warning_count,
-            'suggestion_count': suggestion_count,
-            'review_text': report,
-            'duration_seconds': duration
-        }
-        
-        db.save_review(review_data)
+    return footer
+
+
+def _save_review(diff_type: str, diff: str, report: str, duration: float) -> None:
+    """Save a finished review to the database."""
+    db = ReviewDatabase()
     
-    return report
+    # Count issues by severity
+    critical_count = len(re.findall(r'🔴|Critical', report, re.IGNORECASE))
+    warning_count = len(re.findall(r'🟡|Warning', report, re.IGNORECASE))
+    suggestion_count = len(re.findall(r'🟢|Suggestion', report, re.IGNORECASE))
+    
+    review_data = {
+        'diff_type': diff_type,
+        'file_count': len(re.findall(r'diff --git', diff)),
+        'critical_count': critical_count,
+        'warning_count': warning_count,
+        'suggestion_count': suggestion_count,
+        'review_text': report,
+        'duration_seconds': duration
+    }
+    
+    db.save_review(review_data)
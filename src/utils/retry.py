@@ -1,6 +1,7 @@
 """
 Retry logic with exponential backoff for API calls.
 """
+import asyncio
 import functools
 import logging
 import time
@@ -69,6 +70,53 @@ def retry_with_backoff(
     return decorator
 
 
+def async_retry_with_backoff(
+    max_attempts: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+) -> Callable:
+    """
+    Decorator for retrying coroutines with exponential backoff.
+    
+    Same semantics as ``retry_with_backoff`` but waits with
+    ``asyncio.sleep`` so the event loop keeps serving other requests.
+    
+    Example:
+        @async_retry_with_backoff(max_attempts=5)
+        async def call_api():
+            return await client.get("https://api.example.com")
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            attempt = 0
+            
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    attempt += 1
+                    
+                    if attempt >= max_attempts:
+                        logger.error(
+                            f"{func.__name__} failed after {max_attempts} attempts: {e}"
+                        )
+                        raise
+                    
+                    delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+                    
+                    logger.warning(
+                        f"{func.__name__} attempt {attempt}/{max_attempts} failed: {e}. "
+                        f"Retrying in {delay:.1f}s..."
+                    )
+                    
+                    await asyncio.sleep(delay)
+        
+        return wrapper
+    return decorator
+
+
 class RateLimitError(Exception):
     """Raised when API rate limit is hit."""
     pass
@@ -0,0 +1,161 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """A call in progress that other callers can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+    
+    The first caller for a key runs the function; callers that arrive
+    while it is running wait for it and receive the same result (or the
+    same exception). Nothing is remembered once the call completes, so
+    this complements the review cache rather than replacing it.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, "asyncio.Future[Any]"] = {}
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` once for all concurrent callers with the same key.
+        
+        Args:
+            key: Call identity (e.g. review cache key)
+            func: Zero-argument function to run
+        
+        Returns:
+            Result of ``func``
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        
+        if not leader:
+            logger.info(f"Waiting for in-flight call: {key[:12]}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    async def do_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` once for all concurrent callers with the same key.
+        
+        Args:
+            key: Call identity (e.g. review cache key)
+            func: Zero-argument coroutine function to run
+        
+        Returns:
+            Result of ``func()``
+        """
+        future = self._async_calls.get(key)
+        if future is not None:
+            logger.info(f"Waiting for in-flight call: {key[:12]}")
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure is not logged at GC
+            future.exception()
+            raise
+        finally:
+            del self._async_calls[key]
+    
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+@contextlib.contextmanager
+def file_lease(path: Path, timeout: float = 300.0, poll_interval: float = 0.1) -> Iterator[bool]:
+    """
+    Hold an exclusive cross-process lock on ``path`` while the block runs.
+    
+    Processes on the same host that lease the same path run the block one
+    at a time, so the second can pick up the first's cached result. If the
+    lock cannot be acquired within ``timeout`` (or the platform has no
+    ``fcntl``) the block runs anyway; coalescing is an optimization, not a
+    correctness requirement.
+    
+    Args:
+        path: Lock file path
+        timeout: Maximum seconds to wait for the lock
+        poll_interval: Seconds between lock attempts
+    
+    Yields:
+        True if the lock is held, False if running unlocked
+    """
+    if fcntl is None:
+        yield False
+        return
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    acquired = False
+    
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for lease {path.name}, continuing unlocked")
+                    break
+                time.sleep(poll_interval)
+        
+        yield acquired
+    finally:
+        if acquired:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
@@ -60,3 +60,15 @@ def test_custom_rules_no_matches():
     findings = engine.apply_rules(diff)
     
     assert len(findings) == 0
+
+def test_routing_config_defaults_are_merged(tmp_path):
+    """Test partial routing config is filled in with defaults."""
+    config_path = tmp_path / '.codereview.yaml'
+    config_path.write_text("routing:\n  enabled: true\n  fast_model: tiny\n")
+    
+    routing = ConfigManager(str(config_path)).get_routing_config()
+    
+    assert routing['enabled'] is True
+    assert routing['fast_model'] == 'tiny'
+    assert routing['strong_model'] == 'gemini-2.5-pro'
+    assert routing['escalate_on_critical'] is True
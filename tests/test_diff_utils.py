@@ -0,0 +1,171 @@
+"""
+Tests for diff splitting helpers.
+"""
+from src.diff_utils import (
+    estimate_tokens,
+    get_file_path,
+    limit_diff_size,
+    minimize_diff,
+    pack_diff,
+    split_diff_by_file,
+    split_file_by_hunks,
+    split_oversized_file,
+)
+
+MULTI_FILE_DIFF = """diff --git a/app.py b/app.py
+index 1111111..2222222 100644
+--- a/app.py
++++ b/app.py
+@@ -1,2 +1,3 @@
+ import os
++import sys
+diff --git a/utils/helpers.js b/utils/helpers.js
+index 3333333..4444444 100644
+--- a/utils/helpers.js
++++ b/utils/helpers.js
+@@ -1 +1 @@
+-var x = 1;
++const x = 1;
+"""
+
+
+def test_split_diff_by_file():
+    """Test diff is split on file headers."""
+    chunks = split_diff_by_file(MULTI_FILE_DIFF)
+    
+    assert len(chunks) == 2
+    assert chunks[0].startswith("diff --git a/app.py")
+    assert chunks[1].startswith("diff --git a/utils/helpers.js")
+    assert "".join(chunks) == MULTI_FILE_DIFF
+
+
+def test_split_diff_without_headers():
+    """Test diff without file headers stays in one chunk."""
+    diff = "+print('hello')\n"
+    assert split_diff_by_file(diff) == [diff]
+
+
+def test_get_file_path():
+    """Test file path extraction from a file chunk."""
+    chunks = split_diff_by_file(MULTI_FILE_DIFF)
+    
+    assert get_file_path(chunks[0]) == "app.py"
+    assert get_file_path(chunks[1]) == "utils/helpers.js"
+    assert get_file_path("+no header") is None
+
+
+def test_estimate_tokens():
+    """Test token estimate grows with content and counts punctuation."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("x = 1") == 3
+    assert estimate_tokens("a" * 40) == 10
+
+
+def test_pack_diff_fits_in_one_request():
+    """Test small diffs are sent as a single request."""
+    assert pack_diff(MULTI_FILE_DIFF, 10_000) == [MULTI_FILE_DIFF]
+
+
+def test_pack_diff_bin_packs_files():
+    """Test files are packed into as few requests as fit the budget."""
+    files = [
+        f"diff --git a/f{i}.py b/f{i}.py\n@@ -1 +1 @@\n" + "+value = compute(x)\n" * 10
+        for i in range(6)
+    ]
+    diff = "".join(files)
+    file_tokens = estimate_tokens(files[0])
+    
+    chunks = pack_diff(diff, file_tokens * 2)
+    
+    assert len(chunks) == 3
+    assert all(estimate_tokens(c) <= file_tokens * 2 for c in chunks)
+    assert sorted(sum((split_diff_by_file(c) for c in chunks), [])) == sorted(files)
+
+
+def test_split_oversized_file_at_hunks():
+    """Test a file over budget is split at hunk boundaries with its header."""
+    header = "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n"
+    hunks = [f"@@ -{i},1 +{i},1 @@\n" + "+line = value\n" * 20 for i in range(4)]
+    file_diff = header + "".join(hunks)
+    
+    pieces = split_oversized_file(file_diff, estimate_tokens(header + hunks[0]) + 5)
+    
+    assert len(pieces) == 4
+    assert all(p.startswith(header) for p in pieces)
+    assert split_file_by_hunks(file_diff) == (header, hunks)
+
+
+def test_limit_diff_size():
+    """Test whole files beyond the size limit are dropped."""
+    diff, skipped = limit_diff_size(MULTI_FILE_DIFF, 150)
+    
+    assert diff.startswith("diff --git a/app.py")
+    assert "helpers.js" not in diff
+    assert skipped == ["utils/helpers.js"]
+
+
+NOISY_DIFF = """diff --git a/package-lock.json b/package-lock.json
+index 5555555..6666666 100644
+--- a/package-lock.json
++++ b/package-lock.json
+@@ -1 +1 @@
+-"version": "1.0.0"
++"version": "1.0.1"
+diff --git a/logo.png b/logo.png
+index 7777777..8888888 100644
+Binary files a/logo.png and b/logo.png differ
+diff --git a/old_name.py b/new_name.py
+similarity index 100%
+rename from old_name.py
+rename to new_name.py
+diff --git a/format.py b/format.py
+index 9999999..aaaaaaa 100644
+--- a/format.py
++++ b/format.py
+@@ -1,2 +1,2 @@
+-def f(a,b):
++def f(a, b):
+     return a
+@@ -10 +10 @@
+-x = 1
++x = 2
+diff --git a/build/app.py b/build/app.py
+--- a/build/app.py
++++ b/build/app.py
+@@ -1 +1 @@
+-a = 1
++a = 2
+"""
+
+
+def test_minimize_diff_strips_noise():
+    """Test lockfiles, binaries, renames, index lines and whitespace hunks are reduced."""
+    minimized, stats = minimize_diff(NOISY_DIFF)
+    
+    assert "package-lock.json" not in minimized
+    assert "index " not in minimized
+    assert "Binary file changed" in minimized
+    assert "rename to new_name.py" in minimized
+    assert "similarity index" not in minimized
+    assert "def f(a, b)" not in minimized
+    assert "+x = 2" in minimized
+    assert stats['files_skipped'] == ["package-lock.json"]
+    assert stats['bytes_saved'] > 0
+    assert stats['tokens_saved'] > 0
+
+
+def test_minimize_diff_applies_review_predicate():
+    """Test files rejected by the config predicate are skipped."""
+    minimized, stats = minimize_diff(NOISY_DIFF, lambda path: not path.startswith("build/"))
+    
+    assert "build/app.py" not in minimized
+    assert "build/app.py" in stats['files_skipped']
+
+
+def test_minimize_diff_drops_whitespace_only_file():
+    """Test a file whose hunks are all whitespace-only is skipped."""
+    diff = "diff --git a/a.py b/a.py\n@@ -1 +1 @@\n-x=1\n+x = 1\n"
+    minimized, stats = minimize_diff(diff)
+    
+    assert minimized == ""
+    assert stats['files_skipped'] == ["a.py"]
@@ -39,3 +39,224 @@ def test_analyze_code_diff_api_error(mock_api_call):
         analyze_code_diff("diff --git a/test.py", use_cache=False)
     
     assert "API Error" in str(exc_info.value) or "Failed to analyze" in str(exc_info.value)
+
+@patch('src.llm_client._call_gemini_api')
+def test_analyze_code_diff_parallel(mock_api_call):
+    """Test per-file fan-out merges results into one report."""
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    def fake_review(diff, model_name, api_key, timeout, **kwargs):
+        if "a.py" in diff:
+            return "## 🔴 Critical Issues\n- SQL injection\n\n## 🟡 Warnings\n- None"
+        return "## 🟢 Suggestions\n- Use const"
+    
+    mock_api_call.side_effect = fake_review
+    diff = (
+        "diff --git a/a.py b/a.py\n+query = 'x' + user\n"
+        "diff --git a/b.js b/b.js\n+var y = 2;\n"
+    )
+    
+    result = analyze_code_diff(diff, use_cache=False, parallel=True, max_workers=2)
+    
+    assert mock_api_call.call_count == 2
+    assert "- **a.py**: SQL injection" in result
+    assert "- **b.js**: Use const" in result
+    assert result.index("## 🔴 Critical Issues") < result.index("## 🟢 Suggestions")
+
+
+@patch('src.llm_client._call_gemini_api')
+def test_analyze_code_diff_parallel_partial_failure(mock_api_call):
+    """Test one failing file does not discard the other reviews."""
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    from src.utils.retry import ReviewError
+    
+    def fake_review(diff, model_name, api_key, timeout, **kwargs):
+        if "a.py" in diff:
+            raise ReviewError("timed out")
+        return "## 🟡 Warnings\n- Missing error handling"
+    
+    mock_api_call.side_effect = fake_review
+    diff = "diff --git a/a.py b/a.py\n+x\ndiff --git a/b.py b/b.py\n+y\n"
+    
+    result = analyze_code_diff(diff, use_cache=False, parallel=True)
+    
+    assert "- **b.py**: Missing error handling" in result
+    assert "## ⚠️ Files Not Reviewed\n- a.py" in result
+
+
+@patch('src.llm_client._call_gemini_api')
+def test_analyze_code_diff_packs_large_diff(mock_api_call):
+    """Test diffs over the token budget are split across requests."""
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    mock_api_call.return_value = "## 🟡 Warnings\n- Long function"
+    
+    body = "+value = compute(x)\n" * 100
+    diff = f"diff --git a/a.py b/a.py\n{body}diff --git a/b.py b/b.py\n{body}"
+    
+    result = analyze_code_diff(diff, use_cache=False, max_input_tokens=1)
+    
+    assert mock_api_call.call_count == 2
+    assert "- **a.py**: Long function" in result
+    assert "- **b.py**: Long function" in result
+
+
+@patch('src.llm_client.genai')
+def test_gemini_model_pool_reuses_clients(mock_genai):
+    """Test models are created once per key/model/config and reused."""
+    from src.llm_client import clear_model_pool, get_gemini_model
+    
+    clear_model_pool()
+    mock_genai.GenerativeModel.side_effect = lambda *a, **kw: MagicMock()
+    
+    first = get_gemini_model("key", "gemini-2.5-flash", {"temperature": 0.3})
+    second = get_gemini_model("key", "gemini-2.5-flash", {"temperature": 0.3})
+    other = get_gemini_model("key", "gemini-2.5-pro", {"temperature": 0.3})
+    
+    assert first is second
+    assert other is not first
+    assert mock_genai.GenerativeModel.call_count == 2
+    mock_genai.configure.assert_called_once_with(api_key="key")
+    
+    clear_model_pool()
+
+
+@patch('src.llm_client._open_gemini_stream')
+def test_stream_code_diff_yields_chunks(mock_open_stream):
+    """Test streaming yields model chunks as they arrive."""
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    from src.llm_client import stream_code_diff
+    
+    mock_open_stream.return_value = [
+        MagicMock(text="## 🔴 Critical Issues\n"),
+        MagicMock(text="- Hardcoded secret\n"),
+    ]
+    
+    chunks = list(stream_code_diff("diff --git a/test.py", use_cache=False))
+    
+    assert chunks == ["## 🔴 Critical Issues\n", "- Hardcoded secret\n"]
+
+
+@patch('src.llm_client._open_gemini_stream')
+def test_stream_code_diff_caches_only_complete_reviews(mock_open_stream, tmp_path):
+    """Test an abandoned stream is not cached but a finished one is."""
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    from src.llm_client import stream_code_diff
+    from src.utils.cache import ReviewCache
+    
+    mock_open_stream.side_effect = lambda *a, **kw: [MagicMock(text="part 1"), MagicMock(text=" part 2")]
+    
+    with patch('src.llm_client.ReviewCache', lambda: ReviewCache(cache_dir=tmp_path)):
+        stream = stream_code_diff("diff --git a/stream.py")
+        assert next(stream) == "part 1"
+        stream.close()
+        assert ReviewCache(cache_dir=tmp_path).get_stats()["count"] == 0
+        
+        assert "".join(stream_code_diff("diff --git a/stream.py")) == "part 1 part 2"
+        assert "".join(stream_code_diff("diff --git a/stream.py")) == "part 1 part 2"
+    
+    assert mock_open_stream.call_count == 2
+
+
+@patch('src.llm_client._call_gemini_api_async')
+def test_analyze_code_diff_async_runs_concurrently(mock_api_call):
+    """Test async chunked reviews overlap instead of running serially."""
+    import asyncio
+    import time
+    from src.llm_client import analyze_code_diff_async
+    
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    async def slow_review(diff, *args, **kwargs):
+        await asyncio.sleep(0.2)
+        return "## 🟢 Suggestions\n- Add docstring"
+    
+    mock_api_call.side_effect = slow_review
+    diff = "".join(f"diff --git a/f{i}.py b/f{i}.py\n+x = {i}\n" for i in range(4))
+    
+    start = time.monotonic()
+    result = asyncio.run(analyze_code_diff_async(diff, use_cache=False, parallel=True))
+    elapsed = time.monotonic() - start
+    
+    assert mock_api_call.call_count == 4
+    assert elapsed < 0.6
+    assert "- **f3.py**: Add docstring" in result
+
+
+@patch('src.llm_client._call_gemini_api')
+def test_identical_concurrent_reviews_are_coalesced(mock_api_call, tmp_path):
+    """Test concurrent identical requests share one API call."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.cache import ReviewCache
+    
+    os.environ['GEMINI_API_KEY'] = 'test_key'
+    
+    def slow_review(*args, **kwargs):
+        time.sleep(0.2)
+        return "## Review\nShared"
+    
+    mock_api_call.side_effect = slow_review
+    
+    with patch('src.llm_client.ReviewCache', lambda: ReviewCache(cache_dir=tmp_path)):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: analyze_code_diff("diff --git a/same.py\n+x = 1"), range(4)
+            ))
+    
+    assert results == ["## Review\nShared"] * 4
+    assert mock_api_call.call_count == 1
+
+
+ROUTING = {
+    'enabled': True,
+    'fast_model': 'fast-model',
+    'strong_model': 'strong-model',
+    'max_fast_tokens': 4000,
+    'escalate_on_critical': True,
+    'risk_patterns': [],
+}
+
+
+def test_choose_model_routes_by_risk_and_size():
+    """Test trivial diffs use the fast model and risky or large ones the strong model."""
+    from src.llm_client import choose_model
+    
+    assert choose_model("diff --git a/a.md b/a.md\n+Fix typo\n", ROUTING)[0] == 'fast-model'
+    assert choose_model("+cursor.execute(query)\n", ROUTING)[0] == 'strong-model'
+    assert choose_model("+password = request.form['pw']\n", ROUTING)[0] == 'strong-model'
+    assert choose_model("+el.innerHTML = html\n", ROUTING)[0] == 'strong-model'
+    assert choose_model("+x = 1\n" * 2000, ROUTING)[0] == 'strong-model'
+    # Unchanged context lines do not count as risk
+    assert choose_model(" password = old\n+x = 1\n", ROUTING)[0] == 'fast-model'
+
+
+@patch('src.llm_client.analyze_code_diff')
+def test_analyze_with_routing_escalates_on_critical(mock_analyze):
+    """Test a fast review with critical findings is re-run on the strong model."""
+    from src.llm_client import analyze_with_routing
+    
+    mock_analyze.side_effect = [
+        "## 🔴 Critical Issues\n- Possible crash\n",
+        "## 🔴 Critical Issues\n- Confirmed crash\n",
+    ]
+    
+    result = analyze_with_routing("+x = 1\n", ROUTING)
+    
+    assert [c.args[1] for c in mock_analyze.call_args_list] == ['fast-model', 'strong-model']
+    assert "Confirmed crash" in result
+
+
+@patch('src.llm_client.analyze_code_diff')
+def test_analyze_with_routing_keeps_clean_fast_review(mock_analyze):
+    """Test a fast review without critical findings is returned as is."""
+    from src.llm_client import analyze_with_routing
+    
+    mock_analyze.return_value = "## 🔴 Critical Issues\n- None\n## 🟢 Suggestions\n- Rename x"
+    
+    result = analyze_with_routing("+x = 1\n", ROUTING)
+    
+    mock_analyze.assert_called_once()
+    assert "Rename x" in result
@@ -101,3 +101,13 @@ def test_init_command_with_git(tmp_path, monkeypatch):
     result = runner.invoke(app, ["init"])
     assert result.exit_code == 0
     assert "Git repository detected" in result.stdout
+
+
+@patch('src.reviewer.stream_review')
+def test_review_command_stream(mock_stream):
+    """Test review command renders streamed chunks."""
+    mock_stream.return_value = iter(["## Review\n", "Streamed finding"])
+    result = runner.invoke(app, ["review", "--stream"])
+    assert result.exit_code == 0
+    assert "Streamed finding" in result.stdout
+    mock_stream.assert_called_once()
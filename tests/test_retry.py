@@ -70,3 +70,41 @@ def test_retry_specific_exceptions():
     
     # Should fail on first attempt (no retry for TypeError)
     assert call_count == 1
+
+
+def test_async_retry_success_after_failures():
+    """Test coroutine succeeds after some failures without blocking."""
+    import asyncio
+    from src.utils.retry import async_retry_with_backoff
+    
+    call_count = 0
+    
+    @async_retry_with_backoff(max_attempts=3, base_delay=0.01)
+    async def succeeds_on_third_try():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 3:
+            raise ValueError("Temporary error")
+        return "success"
+    
+    assert asyncio.run(succeeds_on_third_try()) == "success"
+    assert call_count == 3
+
+
+def test_async_retry_max_attempts_exceeded():
+    """Test coroutine fails after max attempts."""
+    import asyncio
+    from src.utils.retry import async_retry_with_backoff
+    
+    call_count = 0
+    
+    @async_retry_with_backoff(max_attempts=2, base_delay=0.01)
+    async def always_fails():
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Permanent error")
+    
+    with pytest.raises(ValueError, match="Permanent error"):
+        asyncio.run(always_fails())
+    
+    assert call_count == 2
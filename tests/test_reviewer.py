@@ -43,9 +43,73 @@ def test_run_review_with_custom_rules(mock_get_diff, mock_analyze, mock_config):
         }
     ]
     mock_config_instance.get_model_name.return_value = 'gemini-2.5-flash'
+    mock_config_instance.get_max_diff_size.return_value = 100
+    mock_config_instance.get_routing_config.return_value = {'enabled': False}
     mock_config.return_value = mock_config_instance
     
     result = run_review(diff_type="staged")
     
     assert "Custom Rules Findings" in result
     assert "Debug statement found" in result
+
+@patch('src.reviewer.ConfigManager')
+@patch('src.reviewer.analyze_code_diff')
+@patch('src.reviewer.get_staged_diff')
+def test_run_review_enforces_max_diff_size(mock_get_diff, mock_analyze, mock_config):
+    """Test files beyond max_diff_size are skipped and reported."""
+    small = "diff --git a/small.py b/small.py\n+x = 1\n"
+    large = "diff --git a/large.py b/large.py\n" + "+y = 2\n" * 400
+    mock_get_diff.return_value = small + large
+    mock_analyze.return_value = "## Review\nNo issues"
+    
+    mock_config_instance = MagicMock()
+    mock_config_instance.get_custom_rules.return_value = []
+    mock_config_instance.get_model_name.return_value = 'gemini-2.5-flash'
+    mock_config_instance.get_max_diff_size.return_value = 1
+    mock_config_instance.get_routing_config.return_value = {'enabled': False}
+    mock_config.return_value = mock_config_instance
+    
+    result = run_review(diff_type="staged", save_to_db=False)
+    
+    assert mock_analyze.call_args[0][0] == small
+    assert "large.py" in result
+
+@patch('src.reviewer.stream_code_diff')
+@patch('src.reviewer.get_staged_diff')
+def test_stream_review_yields_report(mock_get_diff, mock_stream):
+    """Test streamed review matches the chunks from the model."""
+    from src.reviewer import stream_review
+    
+    mock_get_diff.return_value = "diff --git a/test.py b/test.py\n+x = 1\n"
+    mock_stream.return_value = iter(["## Review\n", "No issues"])
+    
+    chunks = list(stream_review(diff_type="staged", save_to_db=False))
+    
+    assert chunks[:2] == ["## Review\n", "No issues"]
+    mock_stream.assert_called_once()
+
+def test_stream_review_with_no_changes():
+    """Test streamed review when no changes are found."""
+    from src.reviewer import stream_review
+    
+    with patch('src.reviewer.get_staged_diff', return_value=None):
+        assert list(stream_review(diff_type="staged")) == ["No staged changes found to review."]
+
+@patch('src.reviewer.analyze_code_diff')
+@patch('src.reviewer.get_staged_diff')
+def test_run_review_minimizes_diff(mock_get_diff, mock_analyze):
+    """Test ignored and generated files never reach the model."""
+    mock_get_diff.return_value = (
+        "diff --git a/yarn.lock b/yarn.lock\n@@ -1 +1 @@\n-a\n+b\n"
+        "diff --git a/node_modules/x/index.js b/node_modules/x/index.js\n@@ -1 +1 @@\n-a\n+b\n"
+        "diff --git a/app.py b/app.py\n@@ -1 +1 @@\n-a = 1\n+a = 2\n"
+    )
+    mock_analyze.return_value = "## Review\nNo issues"
+    
+    result = run_review(diff_type="staged", save_to_db=False)
+    
+    sent_diff = mock_analyze.call_args[0][0]
+    assert "app.py" in sent_diff
+    assert "yarn.lock" not in sent_diff
+    assert "node_modules" not in sent_diff
+    assert "Pre-filter" in result
@@ -0,0 +1,97 @@
+"""
+Tests for single-flight call coalescing.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.utils.singleflight import SingleFlight, file_lease
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test identical concurrent calls run the function once."""
+    flight = SingleFlight()
+    call_count = 0
+    started = threading.Event()
+    
+    def slow_call():
+        nonlocal call_count
+        call_count += 1
+        started.set()
+        time.sleep(0.2)
+        return "review"
+    
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        first = executor.submit(flight.do, "key", slow_call)
+        started.wait()
+        others = [executor.submit(flight.do, "key", slow_call) for _ in range(4)]
+        results = [first.result()] + [f.result() for f in others]
+    
+    assert results == ["review"] * 5
+    assert call_count == 1
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    """Test calls with different keys are not coalesced."""
+    flight = SingleFlight()
+    
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+
+
+def test_error_is_shared_and_not_remembered():
+    """Test waiters see the leader's error and later calls run again."""
+    flight = SingleFlight()
+    
+    def fails():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError, match="boom"):
+        flight.do("key", fails)
+    
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_async_calls_share_one_execution():
+    """Test identical concurrent coroutines are awaited once."""
+    flight = SingleFlight()
+    call_count = 0
+    
+    async def slow_call():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.05)
+        return "review"
+    
+    async def run():
+        return await asyncio.gather(*(flight.do_async("key", slow_call) for _ in range(5)))
+    
+    assert asyncio.run(run()) == ["review"] * 5
+    assert call_count == 1
+
+
+def test_file_lease_serializes_holders(tmp_path):
+    """Test a second holder waits until the first releases the lease."""
+    lock_path = tmp_path / "locks" / "key.lock"
+    order = []
+    
+    def hold(name):
+        with file_lease(lock_path) as acquired:
+            order.append((name, "in", acquired))
+            time.sleep(0.1)
+            order.append((name, "out", acquired))
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(hold, "first")
+        time.sleep(0.02)
+        second = executor.submit(hold, "second")
+        first.result()
+        second.result()
+    
+    assert [step[:2] for step in order] == [
+        ("first", "in"), ("first", "out"), ("second", "in"), ("second", "out")
+    ]
+    assert all(step[2] for step in order)